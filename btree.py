@@ -1,29 +1,145 @@
-from typing import Any
+from __future__ import annotations
 
-from btreenode import BTreeNode
+import sys
+from bisect import bisect_left, bisect_right
+from typing import Any, Iterable
+
+from btreenode import BTreeInt64Node, BTreeNode
 
 
 class BTree:
-    def __init__(self, t: int = 2, rootVal: Any = None) -> None:
+    # classe dos nós criados pela árvore
+    _node_cls: type[BTreeNode] = BTreeNode
+
+    # número de entradas (potência de 2) da cache de buscas recentes
+    _CACHE_SIZE = 64
+
+    def __init__(self, t: int = 32, rootVal: Any = None) -> None:
         """B-tree of minimum degree t, maximum degree 2*t, (minimum number of
         keys: t-1; maximum number of keys: 2*t-1). If 'rootVal' is given,
         initialize root with this value; else, root is None.
 
+        The default degree favors wide, shallow trees: in-node searches are
+        binary searches done in C, so each extra key per node is cheap
+        compared to the Python-level work of descending one more level.
+
         Args:
-            t (int, optional): Minimum node degree. Defaults to 2.
+            t (int, optional): Minimum node degree. Defaults to 32.
             rootVal (Any, optional): Value with which to initialize root. If
             None, root is None. Defaults to None.
         """
         self._t = t
 
+        # limites derivados de t, calculados uma única vez
+        self._min_keys = t - 1
+        self._max_keys = 2 * t - 1
+        self._min_children = t
+        self._max_children = 2 * t
+
         if rootVal is None:
             self._root = None
         else:
-            self._root = BTreeNode(rootVal, is_leaf=True)
+            self._check_key(rootVal)
+            self._root = self._node_cls(rootVal, is_leaf=True)
 
         # variável privada para auxiliar o método print_tree
         self.__levels: list[list[object]] = []
 
+        # cache de mapeamento direto para o método search: hash(key) -> (nó,
+        # índice) do último acerto que caiu naquela posição
+        self._cache: dict[int, tuple[BTreeNode, int]] = {}
+
+    @classmethod
+    def from_sorted(cls, keys: Iterable[Any], t: int = 32, fill: float = 0.75) -> BTree:
+        """Bulk-load a tree from given keys, building it bottom-up: leaves are
+        packed with about `fill * (2*t-1)` keys each, then every upper level
+        is built from the separator keys left between the nodes below it.
+        This takes O(n) after sorting, instead of O(n log n) with node splits
+        when calling `insert` for each key.
+
+        Args:
+            keys (Iterable[Any]): Keys to load. They're sorted first, which is
+            linear if they already are.
+            t (int, optional): Minimum node degree. Defaults to 32.
+            fill (float, optional): Target fraction of each node's capacity to
+            fill. Nodes never get less than t-1 keys (except the root).
+            Defaults to 0.75.
+
+        Raises:
+            ValueError: If 'fill' is not in the interval (0, 1].
+
+        Returns:
+            BTree: A new tree containing the given keys.
+        """
+        if not 0 < fill <= 1:
+            raise ValueError("'fill' parameter must be in the interval (0, 1]!!!")
+
+        tree = cls(t)
+        keys = sorted(keys)
+
+        for key in keys:
+            tree._check_key(key)
+
+        if not keys:
+            return tree
+
+        # capacidade alvo de cada nó, em "posições" (chaves + 1): uma folha
+        # com s posições guarda s-1 chaves, e um nó interno com s posições tem
+        # s filhos e s-1 chaves
+        cap = max(t, int(fill * (2 * t - 1)) + 1)
+
+        # folhas: cada grupo recebe s-1 chaves, e a chave seguinte a ele vira
+        # separadora no nível de cima
+        level: list[BTreeNode] = []
+        seps: list[Any] = []
+        pos = 0
+        for s in cls._group_sizes(len(keys) + 1, cap, t):
+            level.append(cls._node_cls(*keys[pos:pos + s - 1], is_leaf=True))
+            pos += s - 1
+            if pos < len(keys):
+                seps.append(keys[pos])
+                pos += 1
+
+        # níveis internos: cada grupo de s nós do nível de baixo vira filho de
+        # um novo nó, que recebe as s-1 separadoras entre eles
+        while len(level) > 1:
+            parents: list[BTreeNode] = []
+            parent_seps: list[Any] = []
+            pos = 0
+            for s in cls._group_sizes(len(level), cap, t):
+                parent = cls._node_cls(*seps[pos:pos + s - 1])
+                parent._children = level[pos:pos + s]
+                parents.append(parent)
+                pos += s
+                if pos < len(level):
+                    parent_seps.append(seps[pos - 1])
+
+            level, seps = parents, parent_seps
+
+        tree._root = level[0]
+        return tree
+
+    @staticmethod
+    def _group_sizes(total: int, cap: int, t: int) -> list[int]:
+        """Split `total` slots into groups of at most `cap` slots and, unless
+        there's a single group, at least `t` slots each (the size bounds of a
+        non-root node, counted as keys + 1).
+
+        Args:
+            total (int): Number of slots to split.
+            cap (int): Target (and maximum) size of each group.
+            t (int): Minimum node degree.
+
+        Returns:
+            list[int]: The size of each group, as evenly spread as possible.
+        """
+        n_groups = -(-total // cap)
+        if n_groups > 1 and total // n_groups < t:
+            n_groups = max(1, total // t)
+
+        size, extra = divmod(total, n_groups)
+        return [size + 1] * extra + [size] * (n_groups - extra)
+
     @property
     def t(self) -> int:
         """Minimum degree of this tree (of each node). Same as `min_children`.
@@ -39,19 +155,31 @@ class BTree:
 
     @property
     def min_keys(self) -> int:
-        return self._t - 1
+        return self._min_keys
 
     @property
     def max_keys(self) -> int:
-        return 2 * self.t - 1
+        return self._max_keys
 
     @property
     def min_children(self) -> int:
-        return self._t
+        return self._min_children
 
     @property
     def max_children(self) -> int:
-        return 2 * self.t
+        return self._max_children
+
+    def _check_key(self, key: Any) -> None:
+        """Check if given key can be stored in this tree.
+
+        Args:
+            key (Any): The key to check.
+
+        Raises:
+            TypeError: If 'key' is None.
+        """
+        if key is None:
+            raise TypeError("'key' parameter must not be None")
 
     def is_full(self, node: BTreeNode) -> bool:
         """To check if given node is full (reached maximum number of keys/children).
@@ -62,7 +190,7 @@ class BTree:
         Returns:
             bool: True if node is full, False otherwise.
         """
-        return node.n_keys == self.max_keys
+        return len(node._keys) == self._max_keys
 
     def search(self, key: Any) -> tuple[BTreeNode, int] | None:
         """Search for given key in this tree. If found, returns a tuple with
@@ -72,6 +200,9 @@ class BTree:
         Args:
             key (Any): The search key.
 
+        Raises:
+            ValueError: If 'key' is None.
+
         Returns:
             tuple[BTreeNode, int] | None: Tuple with the node that contains the
             search key and the index at which it is found in the node's key
@@ -79,98 +210,179 @@ class BTree:
         """
         if self._root is None:
             return None
-        return self._search(key, self._root)
+
+        # validar a chave uma única vez, aqui na entrada; _search assume
+        # parâmetros válidos
+        if key is None:
+            raise ValueError("'key' parameter must not be None!!!")
+
+        try:
+            slot = hash(key) & (self._CACHE_SIZE - 1)
+        except TypeError:
+            return self._search(key, self._root)
+
+        # nós nunca são removidos da árvore, então uma entrada da cache cujo nó
+        # ainda tem a chave no mesmo índice continua válida mesmo após
+        # inserções; caso contrário, descer a partir da raiz normalmente
+        hit = self._cache.get(slot)
+        if hit is not None:
+            node, i = hit
+            if i < len(node._keys) and node._keys[i] == key:
+                return hit
+
+        result = self._search(key, self._root)
+        if result is not None:
+            self._cache[slot] = result
+        return result
 
     def _search(self, key: Any, node: BTreeNode) -> tuple[BTreeNode, int] | None:
-        """Recursively search for given key starting at given node.
+        """Iteratively search for given key, descending from given node.
+        Parameters aren't validated: both must not be None.
 
         Args:
             key (Any): The search key.
-            node (BTreeNode): The node on which to perform the search.
-
-        Raises:
-            ValueError: If either parameter is None.
+            node (BTreeNode): The node from which to start the search.
 
         Returns:
             tuple[BTreeNode, int] | None: Tuple with the node that contains the
             search key and the index at which it is found in the node's key
             list, or None if the key isn't found.
         """
-        if key is None or node is None:
-            param = "key" if key is None else "node"
-            raise ValueError(f"'{param}' parameter must not be None!!!")
-
-        # encontrar nó que pode ter a chave desejada ou ter um filho que tenha
-        i = 0
-        while i < node.n_keys and key > node.get_key(i):
-            i += 1
-
-        # se i estiver dentro do limite da lista e o nó tiver a chave desejada,
-        # retornar o nó e o índice da chave na lista
-        if i < node.n_keys and key == node.get_key(i):
-            return node, i
-
-        # se keys[i-1] < key < keys[i] (ou key > max(keys)) e 'node' for folha,
-        # a chave não existe
-        if node.is_leaf:
-            return None
-
-        # em último caso, procurar pela chave no filho entre as chaves keys[i-1]
-        # e keys[i] (ou o último filho, caso i tenha passado o limite da lista
-        # de chaves)
-        return self._search(key, node.get_child(i))
+        # descer um nível por iteração, sem recursão (a altura da árvore é
+        # O(log_t n), então o laço termina rapidamente)
+        while True:
+            # encontrar nó que pode ter a chave desejada ou ter um filho que
+            # tenha (busca binária em C sobre a lista ordenada de chaves)
+            # (acesso direto aos atributos do nó, sem getters, por ser o laço
+            # mais executado da árvore)
+            keys = node._keys
+            i = bisect_left(keys, key)
+
+            # se i estiver dentro do limite da lista e o nó tiver a chave
+            # desejada, retornar o nó e o índice da chave na lista
+            if i < len(keys) and key == keys[i]:
+                return node, i
+
+            # se keys[i-1] < key < keys[i] (ou key > max(keys)) e 'node' for
+            # folha, a chave não existe
+            if node._is_leaf:
+                return None
+
+            # em último caso, continuar a busca no filho entre as chaves
+            # keys[i-1] e keys[i] (ou o último filho, caso i tenha passado o
+            # limite da lista de chaves)
+            node = node._children[i]
 
     def insert(self, key: Any) -> None:
         """Insert given key in this tree.
 
         Args:
             key (Any): The new key to insert.
+
+        Raises:
+            TypeError: If 'key' can't be stored in this tree (see `_check_key`).
         """
+        self._check_key(key)
+
         if self._root is None:
-            self._root = BTreeNode(key, is_leaf=True)
+            self._root = self._node_cls(key, is_leaf=True)
             return
 
-        # se raiz estiver cheia, realizar split preventivo
-        if self.is_full(self._root):
-            new_root = BTreeNode()
-            new_root.insert_child(self._root)
+        node = self._root
+        max_keys = self._max_keys
+
+        # se raiz estiver cheia, realizar split preventivo e descer a partir da
+        # nova raiz (verificações de nó cheio feitas inline, sem chamar is_full)
+        if len(node._keys) == max_keys:
+            new_root = self._node_cls()
+            new_root._children.append(node)
             self._root = new_root
 
             self._split_child(new_root, 0)          # split da raiz antiga
-            self._insert_non_full(new_root, key)    # insere nova chave
-            return
-
-        self._insert_non_full(self._root, key)
-
-    def _insert_non_full(self, node: BTreeNode, key: Any) -> None:
-        """Helper method to insert a key in a non-full node.
+            node = new_root
+
+        # descida única até a folha, dividindo no caminho os filhos cheios, de
+        # modo que o nó atual nunca esteja cheio. a chave já foi validada por
+        # _check_key, então as inserções abaixo são feitas direto nas listas
+        # dos nós, sem a validação de insert_key/insert_child
+        while True:
+            # procurar, por busca binária, o índice adequado de inserção da
+            # nova chave (logo após as chaves menores ou iguais a ela)
+            i = bisect_right(node._keys, key)
+
+            # fim da descida: inserir nova chave na folha, no índice adequado
+            if node._is_leaf:
+                node._keys.insert(i, key)
+                return
+
+            # se o nó atual não for folha, verificar se o filho onde será
+            # inserida a nova chave está cheio. se estiver, fazer split do filho
+            if len(node._children[i]._keys) == max_keys:
+                self._split_child(node, i)
+
+                # corrigir índice de inserção
+                if node._keys[i] < key:
+                    i += 1
+
+            # continuar a descida pelo filho correto
+            node = node._children[i]
+
+    def insert_many(self, keys: Iterable[Any]) -> None:
+        """Insert given keys in this tree. Keys are sorted first, so that
+        consecutive keys belonging to the same leaf are inserted straight into
+        it, without descending from the root again for each of them.
 
         Args:
-            node (BTreeNode): Node in which to insert new key.
-            key (Any): The new key.
+            keys (Iterable[Any]): The new keys to insert.
+
+        Raises:
+            TypeError: If any key can't be stored in this tree (see
+            `_check_key`). No key is inserted in this case.
         """
-        # do fim para o começo, procurar o índice adequado de inserção da nova
-        # chave
-        i = node.n_keys
-        while i >= 0 and node.get_key(i - 1) > key:
-            i -= 1
+        keys = sorted(keys)
 
-        # base da recursão: inserir nova chave na folha, no índice adequado
-        if node.is_leaf:
-            node.insert_key(key, i)
-            return
+        for key in keys:
+            self._check_key(key)
 
-        # se o nó atual não for folha, verificar se o filho onde será inserida
-        # a nova chave está cheio. se estiver, fazer split do filho
-        if self.is_full(node.get_child(i)):
-            self._split_child(node, i)
+        # folha onde a última chave foi inserida e a menor separadora à sua
+        # direita em algum ancestral (None se não houver): chaves seguintes
+        # menores que essa separadora também pertencem a essa folha
+        leaf: BTreeNode | None = None
+        upper: Any = None
 
-            # corrigir índice de inserção
-            if node.get_key(i) < key:
-                i += 1
+        for key in keys:
+            if leaf is not None and len(leaf._keys) < self._max_keys \
+                    and (upper is None or key < upper):
+                leaf._keys.insert(bisect_right(leaf._keys, key), key)
+                continue
 
-        # inserir recursivamente nova chave no filho correto
-        self._insert_non_full(node.get_child(i), key)
+            # folha cheia ou chave fora do seu intervalo: inserção normal,
+            # com splits preventivos, e reposicionar o cursor
+            self.insert(key)
+            leaf, upper = self._find_leaf(key)
+
+    def _find_leaf(self, key: Any) -> tuple[BTreeNode, Any]:
+        """Find the leaf in which given key would be inserted.
+
+        Args:
+            key (Any): The key to look for.
+
+        Returns:
+            tuple[BTreeNode, Any]: The leaf, and the smallest separator key
+            greater than the key in the leaf's ancestors (None if there is
+            none), which bounds the keys that belong in that leaf.
+        """
+        node = self._root
+        upper = None
+
+        while not node._is_leaf:
+            keys = node._keys
+            i = bisect_right(keys, key)
+            if i < len(keys):
+                upper = keys[i]
+            node = node._children[i]
+
+        return node, upper
 
     def _split_child(self, node: BTreeNode, i: int) -> None:
         """Split given node's i-th child and move its middle value up to given
@@ -181,16 +393,23 @@ class BTree:
             receive the child's middle value.
             i (int): The index at which is found the child to split.
         """
-        child = node.get_child(i)                       # nó que será dividido
-        new_child = BTreeNode(is_leaf=child.is_leaf)    # novo nó resultado da divisão
-        node.insert_child(new_child, i + 1)             # inserir novo nó à direita do original
-        node.insert_key(child.get_key(self._t - 1), i)  # passar a chave mediana um nível acima
-        new_child._keys = child._keys[self._t:]         # transferir chaves maiores para o novo nó
-        child._keys = child._keys[:self._t - 1]         # manter as chaves menores no original
+        t = self._t
+        child = node._children[i]                            # nó que será dividido
+
+        # novo nó resultado da divisão, criado diretamente com as chaves (e os
+        # filhos) maiores do original
+        new_child = self._node_cls._fast_new(
+            child._keys[t:],
+            [] if child._is_leaf else child._children[t:],
+            child._is_leaf,
+        )
 
-        if not child.is_leaf:
-            new_child._children = child._children[self._t:]     # transferir filhos maiores para o novo nó
-            child._children = child._children[:self._t]         # manter filhos menores no original
+        node._children.insert(i + 1, new_child)              # inserir novo nó à direita do original
+        node._keys.insert(i, child._keys[t - 1])             # passar a chave mediana um nível acima
+        del child._keys[t - 1:]                              # manter as chaves menores no original (in-place)
+
+        if not child._is_leaf:
+            del child._children[t:]                          # manter filhos menores no original (in-place)
 
     def print_inorder(self, sep: str = " ") -> None:
         """Prints tree keys in order with given separator.
@@ -202,8 +421,19 @@ class BTree:
             print(None)
             return
 
-        self._root.keys_inorder(print, end=sep)
-        print()
+        # uma única escrita para a árvore toda, em vez de um print por chave
+        sys.stdout.write(sep.join(map(str, self.to_list())) + sep + "\n")
+
+    def to_list(self) -> list[Any]:
+        """List this tree's keys in order.
+
+        Returns:
+            list[Any]: The keys of this tree, in order.
+        """
+        if self._root is None:
+            return []
+
+        return list(self._root.iter_keys_inorder())
 
     def visualize_tree(self) -> None:
         """Method to output the tree in a human-friendly format. It is
@@ -216,25 +446,28 @@ class BTree:
 
         self.__save_tree_info()
 
-        buffer = ""
+        # fragmentos juntados uma única vez no final, em vez de concatenar
+        # strings repetidamente (O(n²) no pior caso)
+        parts: list[str] = []
 
         for level in self.__levels:
             prev_end = 0
 
             for node in level:
+                keys = node["keys"]     # já convertido para str em __save_node_info
                 total = node["end"] - node["pos"]
-                slack = total - len(str(node["keys"]))
+                slack = total - len(keys)
                 pad = node["pos"] - prev_end
 
-                buffer += " " * (pad + slack // 2)
-                buffer += str(node["keys"])
-                buffer += " " * (slack - slack // 2)
+                parts.append(" " * (pad + slack // 2))
+                parts.append(keys)
+                parts.append(" " * (slack - slack // 2))
 
                 prev_end += pad + total
 
-            buffer += "\n\n"
+            parts.append("\n\n")
 
-        print(buffer)
+        print("".join(parts))
 
     def __save_tree_info(self) -> None:
         """Auxiliary method to save nodes' metadata to pretty-print tree in
@@ -257,7 +490,7 @@ class BTree:
             self.__levels.append([])
 
         this_level = self.__levels[level]
-        this_info = {"keys": str(node.keys), "pos": 0}
+        this_info = {"keys": node._keys_str(), "pos": 0}
 
         if len(this_level) > 0:
             this_info.update({"pos": this_level[-1]["end"] + 2 if i == 0 else 1})
@@ -265,7 +498,7 @@ class BTree:
         if node.is_leaf:
             this_info.update({"end": this_info["pos"] + len(this_info["keys"])})
         else:
-            for i, child in enumerate(node.children):
+            for i, child in enumerate(node._children):
                 self.__save_node_info(child, level + 1, i)
 
             this_info.update({"end": self.__levels[level + 1][-1]["end"]})
@@ -273,6 +506,36 @@ class BTree:
         this_level.append(this_info)
 
 
+class BTreeInt64(BTree):
+    """B-tree specialized for keys that fit a signed 64-bit integer.
+
+    Mixing key types forces every comparison through Python's generic rich
+    comparison; restricting keys to plain ints keeps comparisons on CPython's
+    int fast path and lets nodes pack their keys in a contiguous int64 array
+    (see `BTreeInt64Node`). Use `BTree` for any other comparable key type.
+    """
+    INT64_MIN = -(2 ** 63)
+    INT64_MAX = 2 ** 63 - 1
+
+    _node_cls = BTreeInt64Node
+
+    def _check_key(self, key: Any) -> None:
+        """Check if given key is an int within the signed 64-bit range.
+
+        Args:
+            key (Any): The key to check.
+
+        Raises:
+            TypeError: If 'key' is not an int.
+            OverflowError: If 'key' doesn't fit in a signed 64-bit integer.
+        """
+        if not isinstance(key, int) or isinstance(key, bool):
+            raise TypeError(f"'key' parameter must be an int, not {type(key).__name__}")
+
+        if not self.INT64_MIN <= key <= self.INT64_MAX:
+            raise OverflowError(f"'key' parameter must fit in 64 bits: {key}")
+
+
 if __name__ == "__main__":
     tree = BTree(2)
 
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
-from typing import Any, Callable
+from array import array
+from typing import Any, Callable, Iterator
 
 
 class BTreeNode:
+    # no per-instance __dict__: nodes are the most numerous objects in a tree,
+    # and slot attributes are also faster to access
+    __slots__ = ("_keys", "_children", "_is_leaf")
+
     def __init__(self, *args: Any, is_leaf: bool = False):
         """If *args is given, initialize keys with its values.
 
@@ -11,44 +16,52 @@ class BTreeNode:
             *args (Any, optional): Initial keys.
             is_leaf (bool, optional): Flag to indicate if node is a leaf. Defaults to False.
         """
-        self.__keys: list[Any] = list(args)
-        self.__children: list[BTreeNode] = []
+        # protected (not private) attributes, to facilitate some operations in
+        # BTree class
+        self._keys: list[Any] = list(args)
+        self._children: list[BTreeNode] = []
+        self._is_leaf = is_leaf
+
+    @classmethod
+    def _fast_new(cls, keys: list[Any], children: list[BTreeNode], is_leaf: bool) -> BTreeNode:
+        """Create a node that takes ownership of the given containers, without
+        copying them and without going through `__init__`. For internal use:
+        'keys' must already be of the container type this class uses.
+
+        Args:
+            keys (list[Any]): The node's keys.
+            children (list[BTreeNode]): The node's children.
+            is_leaf (bool): Flag to indicate if node is a leaf.
+
+        Returns:
+            BTreeNode: The new node.
+        """
+        node = object.__new__(cls)
+        node._keys = keys
+        node._children = children
+        node._is_leaf = is_leaf
+        return node
 
     @property
     def keys(self) -> list[Any]:
-        """Getter for keys.
+        """Getter for keys. No copy is made, so the returned list must be
+        treated as read-only.
 
         Returns:
-            list[Any]: A shallow copy of the node's keys list.
+            list[Any]: The node's keys list.
         """
-        return self.__keys[:]
+        return self._keys
 
     @property
     def children(self) -> list[BTreeNode]:
-        """Getter for children
+        """Getter for children. No copy is made, so the returned list must be
+        treated as read-only.
 
         Returns:
-            list[BTreeNode]: A shallow copy of the node's children list.
+            list[BTreeNode]: The node's children list.
         """
-        return self.__children[:]
-    
-    @property
-    def _keys(self) -> list[Any]:
-        return self.__keys
-    
-    # protected getters and setters to facilitate some operations in BTree class
-    @_keys.setter
-    def _keys(self, keys: list[Any]) -> None:
-        self.__keys = keys
-        
-    @property
-    def _children(self) -> list[BTreeNode]:
-        return self.__children
+        return self._children
     
-    @_children.setter
-    def _children(self, children: list[BTreeNode]) -> None:
-        self.__children = children
-
     @property
     def n_keys(self) -> int:
         """Getter for current number of keys.
@@ -56,7 +69,7 @@ class BTreeNode:
         Returns:
             int: Current number of keys in this node.
         """
-        return len(self.__keys)
+        return len(self._keys)
 
     @property
     def n_children(self) -> int:
@@ -65,11 +78,11 @@ class BTreeNode:
         Returns:
             int: Current number of children in this node.
         """
-        return len(self.__children)
+        return len(self._children)
 
     @property
     def is_leaf(self) -> bool:
-        return self.n_children == 0
+        return self._is_leaf
     
     def get_key(self, i: int) -> Any:
         """Get key at index 'i'.
@@ -83,7 +96,7 @@ class BTreeNode:
         Raises: 
             IndexError: If index is out of range.
         """
-        return self.__keys[i]
+        return self._keys[i]
     
     def get_child(self, i: int) -> BTreeNode:
         """Get child at index 'i'.
@@ -97,7 +110,7 @@ class BTreeNode:
         Raises: 
             IndexError: If index is out of range.
         """
-        return self.__children[i]
+        return self._children[i]
     
     def insert_key(self, key: Any, i: int | None = None) -> None:
         """Inserts given key at index i.
@@ -114,9 +127,9 @@ class BTreeNode:
             raise TypeError("'key' parameter must not be None")
         
         if i is not None:
-            self.__keys.insert(i, key)
+            self._keys.insert(i, key)
         else:
-            self.__keys.append(key)
+            self._keys.append(key)
         
     def insert_child(self, child: BTreeNode, i: int | None = None) -> None:
         """Inserts given child at index i.
@@ -133,9 +146,9 @@ class BTreeNode:
             raise TypeError("'child' parameter must not be None")
         
         if i is not None:
-            self.__children.insert(i, child)
+            self._children.insert(i, child)
         else:
-            self.__children.append(child)
+            self._children.append(child)
 
     def keys_inorder(self, f: Callable, *args: tuple[Any], **kwargs: Any) -> None:
         """Traverses the tree in order, applying f to the keys.
@@ -145,16 +158,80 @@ class BTreeNode:
             *args: unnamed arguments passed to f on each call.
             **kwargs: keyword arguments passed to f on each call.
         """
-        for i, value in enumerate(self.__keys):
-            if not self.is_leaf:
-                self.__children[i].keys_inorder(f, *args, **kwargs)
+        for value in self.iter_keys_inorder():
             f(value, *args, **kwargs)
 
-        if not self.is_leaf:
-            self.__children[-1].keys_inorder(f, *args, **kwargs)
-            
+    def iter_keys_inorder(self) -> Iterator[Any]:
+        """Traverses the tree in order, yielding its keys.
+
+        Yields:
+            Any: Each key of this node's subtree, in order.
+        """
+        # explicit stack of (node, index of the next child to visit) instead of
+        # recursion, so no Python frame is created per visited node
+        stack: list[tuple[BTreeNode, int]] = [(self, 0)]
+        pop = stack.pop
+        push = stack.append
+
+        while stack:
+            node, i = pop()
+            keys = node._keys
+
+            if node._is_leaf:
+                yield from keys
+                continue
+
+            # child i-1 was fully visited, so its separator key comes next
+            if 0 < i <= len(keys):
+                yield keys[i - 1]
+
+            if i <= len(keys):
+                push((node, i + 1))
+                push((node._children[i], 0))
+
+    def _keys_str(self) -> str:
+        """Keys formatted as a list, for printing.
+
+        Returns:
+            str: String representation of the node's keys.
+        """
+        return str(self._keys)
+
+    def debug_tree_str(self) -> str:
+        """Full dump of this node's subtree, with every descendant's keys. Its
+        size grows with the whole subtree, so use it only for debugging.
+
+        Returns:
+            str: String representation of this node's subtree.
+        """
+        children = ", ".join(child.debug_tree_str() for child in self._children)
+        return f"{{ keys: {self._keys_str()}, children: [{children}], is_leaf: {self._is_leaf} }}"
+
     def __str__(self):
-        return f"{{ keys: {self.__keys}, children: {self.__children}, is_leaf: {self._is_leaf} }}"
+        # children are shown through their (shallow) repr, so printing a node
+        # doesn't format its whole subtree; see debug_tree_str for that
+        return f"{{ keys: {self._keys_str()}, children: {self._children}, is_leaf: {self._is_leaf} }}"
 
     def __repr__(self) -> str:
-        return self.__str__()
+        return f"{type(self).__name__}(n_keys={len(self._keys)}, is_leaf={self._is_leaf})"
+
+
+class BTreeInt64Node(BTreeNode):
+    __slots__ = ()
+
+    def __init__(self, *args: int, is_leaf: bool = False):
+        """Node whose keys are packed in a contiguous array of signed 64-bit
+        integers instead of a list of int objects, so slicing its keys (e.g.
+        when splitting) is a plain memory copy. If *args is given, initialize
+        keys with its values.
+
+        Args:
+            *args (int, optional): Initial keys.
+            is_leaf (bool, optional): Flag to indicate if node is a leaf. Defaults to False.
+        """
+        self._keys: array[int] = array("q", args)
+        self._children: list[BTreeNode] = []
+        self._is_leaf = is_leaf
+
+    def _keys_str(self) -> str:
+        return str(self._keys.tolist())
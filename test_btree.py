@@ -1,10 +1,33 @@
 import pytest
 import re
-from btree import BTree
+from array import array
+from btree import BTree, BTreeInt64
 
 from btreenode import BTreeNode
 
 
+def assert_valid_btree(tree, elements):
+    in_order = []
+    tree.root.keys_inorder(in_order.append)
+    assert in_order == sorted(elements)
+
+    # every node must respect the degree bounds and all leaves must be at the
+    # same depth
+    leaf_depths = set()
+    stack = [(tree.root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        assert node.n_keys <= tree.max_keys
+        if node is not tree.root:
+            assert node.n_keys >= tree.min_keys
+        if node.is_leaf:
+            leaf_depths.add(depth)
+        else:
+            assert node.n_children == node.n_keys + 1
+            stack.extend((child, depth + 1) for child in node.children)
+    assert len(leaf_depths) == 1
+
+
 class TestBTree:
 
     @pytest.mark.parametrize("input_value,expected", [
@@ -160,3 +183,100 @@ class TestBTree:
         assert rlchild.is_leaf == True
         assert rmchild.is_leaf == True
         assert rrchild.is_leaf == True
+
+    @pytest.mark.parametrize("t", [2, 3, 5])
+    @pytest.mark.parametrize("n", [0, 1, 2, 7, 50, 333])
+    def test_from_sorted(self, t, n):
+        elements = list(range(n, 0, -1))
+
+        tree = BTree.from_sorted(elements, t)
+
+        if n == 0:
+            assert tree.root is None
+            return
+
+        assert_valid_btree(tree, elements)
+
+        for element in elements:
+            assert tree.search(element) is not None
+        assert tree.search(n + 1) is None
+
+    def test_search_cache(self):
+        tree = BTree(2)
+
+        for element in range(0, 100, 2):
+            tree.insert(element)
+            assert tree.search(element) is not None
+
+        # inserting after lookups moves cached keys around (shifts and splits);
+        # cached hits must still point at the key that was asked for
+        for element in range(1, 100, 2):
+            tree.insert(element)
+
+        for element in range(100):
+            node, i = tree.search(element)
+            assert node.keys[i] == element
+            node, i = tree.search(element)
+            assert node.keys[i] == element
+
+        assert tree.search(100) is None
+
+    @pytest.mark.parametrize("elements", [
+        [5, 6, 3],
+        list(range(30, 0, -1)),
+        [17, 3, 25, 8, 1, 30, 12, 12, 22, 5, 19, 0, 28, 14, 9],
+    ])
+    def test_insert_unordered(self, elements):
+        tree = BTree(2)
+
+        for element in elements:
+            tree.insert(element)
+
+        in_order = []
+        tree.root.keys_inorder(in_order.append)
+
+        assert in_order == sorted(elements)
+        assert list(tree.root.iter_keys_inorder()) == sorted(elements)
+
+    def test_int64_tree(self):
+        elements = [17, 3, 25, 8, 1, 30, -12, 2 ** 63 - 1, -(2 ** 63)]
+
+        tree = BTreeInt64(2)
+
+        for element in elements:
+            tree.insert(element)
+
+        assert isinstance(tree.root._keys, array)
+
+        in_order = []
+        tree.root.keys_inorder(in_order.append)
+        assert in_order == sorted(elements)
+
+        assert tree.search(25) is not None
+        assert tree.search(25.5) is None
+
+        for invalid, error in [(1.0, TypeError), ("1", TypeError), (None, TypeError),
+                               (True, TypeError), (2 ** 63, OverflowError)]:
+            with pytest.raises(error):
+                tree.insert(invalid)
+            with pytest.raises(error):
+                BTreeInt64.from_sorted([1, invalid])
+
+    @pytest.mark.parametrize("t", [2, 3, 5])
+    def test_insert_many(self, t):
+        existing = list(range(0, 300, 3))
+        elements = list(range(500, 0, -2)) + [9, 9, 9]
+
+        tree = BTree(t)
+        tree.insert_many(existing)
+        assert_valid_btree(tree, existing)
+
+        tree.insert_many(elements)
+        assert_valid_btree(tree, existing + elements)
+        assert tree.to_list() == sorted(existing + elements)
+
+        for element in elements:
+            assert tree.search(element) is not None
+
+        with pytest.raises(TypeError):
+            tree.insert_many([1, None])